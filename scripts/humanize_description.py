@@ -1,3 +1,4 @@
+import functools
 import re
 
 # -------------------------------------------------
@@ -45,76 +46,84 @@ TOKEN_RULES = {
 
 QUALI_TOKENS = {"q1", "q2", "q3"}
 
+# -------------------------------------------------
+# Mapas achatados derivados das regras (uma vez, no import):
+# um único lookup de dict no loop em vez de dict-de-dicts + .get("role")
+# -------------------------------------------------
+
+_LABELS = {k: v["label"] for k, v in TOKEN_RULES.items()}
+_LABELS.update({t: t.upper() for t in QUALI_TOKENS})
+
+_SUFFIX_TOKENS = {k for k, v in TOKEN_RULES.items() if v.get("role") == "suffix"}
+_SUFFIX_TOKENS |= QUALI_TOKENS
+
+# Compilado uma vez no import — evita o probe do cache do re a cada chamada
+_UNDERSCORE_RE = re.compile(r"_+")
+
 # -------------------------------------------------
 # Função principal
 # -------------------------------------------------
 
+@functools.lru_cache(maxsize=4096)
 def humanize_description(slug: str) -> str:
     s = slug.lower()
-    s = re.sub(r"_+", " ", s).strip()
+    s = _UNDERSCORE_RE.sub(" ", s).strip()
     tokens = s.split()
 
     out = []
     suffixes = []
     round_info = None
 
-    i = 0
-    while i < len(tokens):
-        t = tokens[i]
-
-        # ----------------------------
-        # Q1 / Q2 / Q3
-        # ----------------------------
-        if t in QUALI_TOKENS:
-            suffixes.append(t.upper())
-            i += 1
-            continue
-
-        # ----------------------------
-        # Etapa ordinal
-        # ----------------------------
-        if t.isdigit() and i + 1 < len(tokens) and tokens[i + 1] == "etapa":
-            out.append(f"{t}ª Etapa")
-            i += 2
-            continue
+    # Iterador com "pushback" de um token: o look-ahead dos dígitos
+    # consome via next() em vez de indexar com checagem de limites
+    it = iter(tokens)
+    pushback = None
+    while True:
+        t = pushback if pushback is not None else next(it, None)
+        pushback = None
+        if t is None:
+            break
 
         # ----------------------------
-        # Fração (8 8) → (8/8)
+        # Dígito: etapa ordinal ou fração (8 8) → (8/8)
         # ----------------------------
-        if t.isdigit() and i + 1 < len(tokens) and tokens[i + 1].isdigit():
-            round_info = f"{t}/{tokens[i + 1]}"
-            i += 2
+        if t.isdigit():
+            nxt = next(it, None)
+            if nxt == "etapa":
+                out.append(f"{t}ª Etapa")
+                continue
+            if nxt is not None and nxt.isdigit():
+                round_info = f"{t}/{nxt}"
+                continue
+            out.append(t)
+            pushback = nxt
             continue
 
         # ----------------------------
-        # Token conhecido
+        # Token conhecido (inclui Q1/Q2/Q3)
         # ----------------------------
-        rule = TOKEN_RULES.get(t)
-        if rule:
-            label = rule["label"]
-            if rule.get("role") == "suffix":
-                suffixes.append(label)
-            else:
-                out.append(label)
-            i += 1
+        label = _LABELS.get(t)
+        if label is not None:
+            (suffixes if t in _SUFFIX_TOKENS else out).append(label)
             continue
 
         # ----------------------------
         # Palavra genérica
         # ----------------------------
         out.append(t.capitalize())
-        i += 1
 
     # -------------------------------------------------
     # Montagem final
     # -------------------------------------------------
 
-    result = " ".join(out)
+    # Uma única concatenação no final, sem strings temporárias de +=
+    parts = [" ".join(out)]
 
     if suffixes:
-        result += " – " + " – ".join(suffixes)
+        parts.append(" – ")
+        parts.append(" – ".join(suffixes))
 
     if round_info:
-        result += f" ({round_info})"
+        parts.append(f" ({round_info})")
 
-    return result
\ No newline at end of file
+    return "".join(parts)
\ No newline at end of file
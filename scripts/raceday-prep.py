@@ -2,62 +2,128 @@
 # -*- coding: utf-8 -*-
 
 import argparse
-import configparser
+import functools
 import json
 import os
 import re
+import string
 import sys
 import io
 import unicodedata
+from collections import defaultdict
 from datetime import datetime, timezone
 
+# orjson serializa em C (3-10× mais rápido que o json da stdlib);
+# opcional — sem ele caímos no json.dump de sempre
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # 1. FORÇA O TERMINAL A ACEITAR UTF-8
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 
+# Padrões compilados uma vez no import — reutilizados em muitas iterações de seção
+_SLOT_RE = re.compile(r"slot_(\d+)_")
+_SLOT_KV_RE = re.compile(r"slot_(\d+)_(.+)")
+
+# Chaves do registro de slot, compartilhadas entre todos os registros
+_SLOT_KEYS = ("p_id", "name", "laps", "best")
+_RACE_SECTION_RE = re.compile(r"race_(\d+)_(\d+)")
+
+# Dobra de acentos por tabela: o repertório acentuado real (PT-BR) é
+# pequeno e conhecido, então um translate direto substitui a
+# decomposição NFKD completa na grande maioria dos casos
+_FOLD = str.maketrans(
+    "áàâãäåéèêëíìîïóòôõöúùûüçñÁÀÂÃÄÅÉÈÊËÍÌÎÏÓÒÔÕÖÚÙÛÜÇÑ",
+    "aaaaaaeeeeiiiiooooouuuucnAAAAAAEEEEIIIIOOOOOUUUUCN"
+)
+
+# Tabela de translate equivalente a re.sub(r"[^\w\s-]", "", ...) sobre ASCII:
+# apaga tudo que não for letra, dígito, espaço em branco, "_" ou "-"
+_STRIP_TABLE = {
+    c: None
+    for c in range(0x80)
+    if chr(c) not in string.ascii_letters + string.digits + string.whitespace + "_-"
+}
+
+# Funde .replace(" ", "_") + .lower() numa única passada de translate
+_CASE_FOLD = str.maketrans(
+    {**{c: c + 32 for c in range(ord("A"), ord("Z") + 1)}, ord(" "): ord("_")}
+)
+
+@functools.lru_cache(maxsize=4096)
 def slugify(text: str) -> str:
     """
     Remove acentuação corretamente:
     'CONFRATERNIZAÇÃO' -> 'confraternizacao'
+
+    Memoizada: os mesmos slugs (pilotos, eventos, seções) repetem
+    muito, então chamadas repetidas viram um lookup de dict.
     """
     if not text:
         return "corrida"
 
-    # Normalização compatível (mais segura que NFD)
-    text = unicodedata.normalize("NFKD", text)
+    # Caminho rápido: a maioria dos nomes já é ASCII puro,
+    # então pulamos a normalização NFKD inteira
+    if text.isascii():
+        return text.translate(_STRIP_TABLE).strip().translate(_CASE_FOLD)
 
-    # Remove qualquer acento de forma definitiva
-    text = text.encode("ascii", "ignore").decode("ascii")
+    # Dobra os acentos conhecidos numa única passada em C
+    text = text.translate(_FOLD)
 
-    # Limpeza final
-    text = re.sub(r"[^\w\s-]", "", text)
-    text = text.strip().replace(" ", "_").lower()
+    if not text.isascii():
+        # Caso raro fora da tabela: normalização compatível (mais
+        # segura que NFD) e remoção definitiva do que sobrar
+        text = unicodedata.normalize("NFKD", text)
+        text = text.encode("ascii", "ignore").decode("ascii")
 
-    return text
+    # Limpeza final (translate em C, sem regex)
+    return text.translate(_STRIP_TABLE).strip().translate(_CASE_FOLD)
 
 def parse_int(value: str) -> int:
-    try: return int(value)
-    except: return 0
+    # Sem try/except: evita a maquinaria de exceção por valor inválido
+    # e o bare except que engolia até KeyboardInterrupt
+    if value.isdigit() or (value[:1] == "-" and value[1:].isdigit()):
+        return int(value)
+    return 0
 
-def centiseconds_to_seconds(raw: int) -> float:
-    return raw / 10000.0 if raw > 0 else 0.0
+def _parse_ini(path: str, encoding: str) -> dict[str, dict[str, str]]:
+    """
+    Parser INI de passada única: o SlotChrono só precisa de
+    {seção: {chave: valor}}, então um split direto linha a linha
+    substitui todo o maquinário do configparser.
+    Chaves são normalizadas para minúsculas (mesmo comportamento).
+    """
+    sections: dict[str, dict[str, str]] = {}
+    current = None
+    # Decodifica linha a linha direto do arquivo — sem materializar
+    # o conteúdo inteiro em bytes e de novo em str
+    with open(path, "r", encoding=encoding) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line[0] in ";#":
+                continue
+            if line[0] == "[" and line[-1] == "]":
+                current = sections.setdefault(line[1:-1].strip(), {})
+                continue
+            if current is None:
+                continue
+            key, sep, value = line.partition("=")
+            if sep:
+                current[key.strip().lower()] = value.strip()
 
-def read_ini_with_fallback(path: str) -> configparser.ConfigParser:
-    config = configparser.ConfigParser(strict=False, interpolation=None)
+    return sections
 
+def read_ini_with_fallback(path: str) -> dict[str, dict[str, str]]:
     try:
-        with open(path, "rb") as f:
-            raw_data = f.read()
-
         # 1️⃣ tenta UTF-8 primeiro (correto em 2025)
         try:
-            text = raw_data.decode("utf-8")
+            return _parse_ini(path, "utf-8")
         except UnicodeDecodeError:
             # 2️⃣ fallback real para arquivos Windows antigos
-            text = raw_data.decode("cp1252")
-
-        config.read_string(text)
-        return config
+            return _parse_ini(path, "cp1252")
 
     except Exception as e:
         print(f"ERRO CRÍTICO: Falha ao ler arquivo: {e}", file=sys.stderr)
@@ -83,7 +149,7 @@ def main() -> None:
 
     # --- 2. METADADOS E SLUGS ---
     # Pegamos o nome original com acentos
-    raw_name = config.get("config", "name", fallback="Corrida").strip('"')
+    raw_name = config["config"].get("name", "Corrida").strip('"')
     display_title = raw_name
     # Geramos o slug limpo (sem acentos) para o nome do arquivo/URL
     slug = slugify(display_title)
@@ -97,13 +163,13 @@ def main() -> None:
     report_filename = f"{club_slug}_{track_slug}_{slug}_{ini_timestamp}.html"
     report_link = f"https://pub-598608239bfb446e841ac7b4290a0223.r2.dev/reports/{report_filename}"
     
-    # Detecção dinâmica de slots
-    max_slot = 0
-    slot_pattern = re.compile(r"slot_(\d+)_")
-    for section in config.sections():
-        for key in config[section].keys():
-            m = slot_pattern.match(key)
-            if m: max_slot = max(max_slot, int(m.group(1)))
+    # Detecção dinâmica de slots: o layout de slots é uniforme entre
+    # as sessões, então basta inspecionar race_1_1 (garantida pela
+    # validação acima) em vez de varrer todas as seções × chaves
+    max_slot = max(
+        (int(m.group(1)) for k in config["race_1_1"] if (m := _SLOT_RE.match(k))),
+        default=0
+    )
 
     # --- 3. ESTRUTURA DO JSON ---
     result = {
@@ -114,7 +180,7 @@ def main() -> None:
         "event": {
             "title": display_title,
             "slug": slug,
-            "date": config.get("config", "date", fallback=""),
+            "date": config["config"].get("date", ""),
             "timestamp": ini_timestamp
         },
         "metadata": {
@@ -126,63 +192,89 @@ def main() -> None:
         "official_ranking": [], 
         "pilots": {k: {"name": v.strip('"')} for k, v in config["pilots"].items()},
         "races": [],
+        # O parser já devolve dicts puros e ninguém muta o config depois
+        # daqui: referenciamos as seções direto, sem copiar chave a chave
         "raw_results": {
-            "laps": dict(config["gp_result_laps"]),
-            "best_times": dict(config["gp_result_best_times"]),
-            "gaps": dict(config["gp_result_gap"]) if "gp_result_gap" in config else {},
-            "zones": dict(config["gp_result_zone"]) if "gp_result_zone" in config else {},
-            "penaltys": dict(config["gp_result_penaltys"]) if "gp_result_penaltys" in config else {}
+            "laps": config["gp_result_laps"],
+            "best_times": config["gp_result_best_times"],
+            "gaps": config.get("gp_result_gap", {}),
+            "zones": config.get("gp_result_zone", {}),
+            "penaltys": config.get("gp_result_penaltys", {})
         }
     }
 
     # --- 4. CONSTRUÇÃO DO RANKING OFICIAL ---
+    best_times = config.get("gp_result_best_times", {})
+    laps = config.get("gp_result_laps", {})
+    gaps = config.get("gp_result_gap", {})
     for p_id, p_name in config["gp_result_pilots"].items():
-        best_raw = parse_int(config.get("gp_result_best_times", p_id, fallback="0"))
+        best_raw = parse_int(best_times.get(p_id, "0"))
         result["official_ranking"].append({
             "p_id": p_id,
             "name": p_name.strip('"'),
-            "laps": parse_int(config.get("gp_result_laps", p_id, fallback="0")),
-            "gap": config.get("gp_result_gap", p_id, fallback="0"),
-            "best_lap": centiseconds_to_seconds(best_raw)
+            "laps": parse_int(laps.get(p_id, "0")),
+            "gap": gaps.get(p_id, "0"),
+            "best_lap": best_raw / 10000.0 if best_raw > 0 else 0.0
         })
 
     # --- 5. SESSÕES DE BATERIA ---
-    race_section_re = re.compile(r"race_(\d+)_(\d+)")
-    race_sessions = {}
-    for section in config.sections():
-        m = race_section_re.fullmatch(section)
+    race_sessions = defaultdict(list)
+    for section in config:
+        m = _RACE_SECTION_RE.fullmatch(section)
         if m:
-            r_id, s_id = int(m.group(1)), int(m.group(2))
-            race_sessions.setdefault(r_id, []).append(s_id)
+            race_sessions[int(m.group(1))].append(int(m.group(2)))
 
-    for r_id in sorted(race_sessions.keys()):
+    for r_id, session_ids in sorted(race_sessions.items()):
         race_obj = {"race_id": r_id, "name": f"Bateria {r_id}", "sessions": []}
-        for s_id in sorted(race_sessions[r_id]):
+        for s_id in sorted(session_ids):
             sec_name = f"race_{r_id}_{s_id}"
             sec = config[sec_name]
             session_obj = {"session": s_id, "slots": {}}
-            for slot in range(1, max_slot + 1):
-                prefix = f"slot_{slot}_"
-                pname = sec.get(prefix + "pilot_name", "").strip()
+            # Agrupa as chaves da seção por slot numa única passada,
+            # em vez de 4 gets com prefixo concatenado por slot
+            slots_data = defaultdict(dict)
+            for key, value in sec.items():
+                m = _SLOT_KV_RE.match(key)
+                if m:
+                    slots_data[int(m.group(1))][m.group(2)] = value
+            for slot in sorted(slots_data):
+                d = slots_data[slot]
+                pname = d.get("pilot_name", "").strip()
                 if pname:
-                    p_id = sec.get(prefix + "pilot_number", "0")
-                    best_raw = parse_int(sec.get(prefix + "best", "0"))
-                    session_obj["slots"][str(slot)] = {
-                        "p_id": p_id,
-                        "name": pname,
-                        "laps": parse_int(sec.get(prefix + "laps", "0")),
-                        "best": centiseconds_to_seconds(best_raw)
-                    }
+                    best_raw = parse_int(d.get("best", "0"))
+                    # sys.intern: o número do slot e o id do piloto se
+                    # repetem a cada sessão × bateria — compartilha um
+                    # único objeto str em vez de alocar um por linha
+                    session_obj["slots"][sys.intern(str(slot))] = dict(zip(_SLOT_KEYS, (
+                        sys.intern(d.get("pilot_number", "0")),
+                        pname,
+                        parse_int(d.get("laps", "0")),
+                        best_raw / 10000.0 if best_raw > 0 else 0.0
+                    )))
             race_obj["sessions"].append(session_obj)
         result["races"].append(race_obj)
 
     # --- SAÍDA ---
-    json_output = json.dumps(result, ensure_ascii=False, indent=2)
-    if args.output == "stdout":
-        print(json_output)
+    if orjson is not None:
+        # bytes prontos, direto no destino binário — sem decode intermediário
+        # e num único write (payload + newline já concatenados)
+        payload = orjson.dumps(result, option=orjson.OPT_INDENT_2)
+        if args.output == "stdout":
+            sys.stdout.buffer.write(payload + b"\n")
+            sys.stdout.buffer.flush()
+        else:
+            with open(args.output, "wb", buffering=1 << 20) as f:
+                f.write(payload)
     else:
-        with open(args.output, "w", encoding="utf-8") as f:
-            f.write(json_output)
+        # json.dump direto no destino: evita materializar o JSON inteiro
+        # numa segunda string gigante (pico de memória = dict + str)
+        if args.output == "stdout":
+            json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
+            sys.stdout.write("\n")
+            sys.stdout.flush()
+        else:
+            with open(args.output, "w", encoding="utf-8", buffering=1 << 20) as f:
+                json.dump(result, f, ensure_ascii=False, indent=2)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file